@@ -8,6 +8,8 @@ import tomllib
 import urllib.request
 from pathlib import Path
 
+from fs_utils import preallocate
+
 PROJECT_ROOT = Path(__file__).parent.parent
 PYPROJECT = PROJECT_ROOT / "pyproject.toml"
 OUTPUT = PROJECT_ROOT / "gtfs-validator.jar"
@@ -25,13 +27,29 @@ except KeyError:
     sys.exit(1)
 
 
-def progress(block_count, block_size, total_size):
+def progress(bytes_so_far, total_size):
     if total_size > 0:
-        percent = min(block_count * block_size / total_size * 100, 100)
+        percent = min(bytes_so_far / total_size * 100, 100)
         bar = "#" * int(percent / 2)
         print(f"\r  [{bar:<50}] {percent:.1f}%", end="", flush=True)
 
 
 print(f"Downloading: {url}")
-urllib.request.urlretrieve(url, OUTPUT, reporthook=progress)
+
+# Read in 1 MiB chunks and report progress every 8 MiB; urlretrieve's default
+# 8 KiB blocks mean thousands of tiny reads and progress callbacks for a
+# multi-MB JAR.
+CHUNK_SIZE = 1 << 20
+
+with urllib.request.urlopen(url) as resp, open(OUTPUT, "wb") as out:
+    total_size = int(resp.headers.get("Content-Length", 0))
+    preallocate(out.fileno(), total_size)
+    bytes_so_far = 0
+    while chunk := resp.read(CHUNK_SIZE):
+        out.write(chunk)
+        bytes_so_far += len(chunk)
+        if (bytes_so_far >> 20) % 8 == 0:
+            progress(bytes_so_far, total_size)
+    progress(bytes_so_far, total_size)
+
 print(f"\nSaved to: {OUTPUT}")
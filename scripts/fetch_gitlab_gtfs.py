@@ -10,9 +10,11 @@ By default, downloads both bus and rail.
 
 import argparse
 import tomllib
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from fs_utils import download_file
+
 # ---------------------------------------------------------------------------
 # Configuration – read GitLab permalinks from gtfs-meta.toml
 # ---------------------------------------------------------------------------
@@ -50,15 +52,22 @@ services = [args.service] if args.service else SERVICES
 CURRENT_DIR = PROJECT_ROOT / "gtfs" / "current"
 CURRENT_DIR.mkdir(parents=True, exist_ok=True)
 
-for service in services:
+def _download(service: str) -> None:
     url = GITLAB_URLS[service]
-    if not url:
-        print(f"[{service}] No URL configured – skipping.")
-        continue
-
     dest = CURRENT_DIR / f"gtfs_{service}.zip"
     print(f"[{service}] Downloading {url} ...")
-    urllib.request.urlretrieve(url, dest)
+    download_file(url, dest)
     print(f"[{service}] Saved to {dest.relative_to(PROJECT_ROOT)}")
 
+
+for service in services:
+    if not GITLAB_URLS[service]:
+        print(f"[{service}] No URL configured – skipping.")
+
+# The bus and rail zips are independent and network-bound, so fetch them
+# concurrently rather than one after the other.
+to_fetch = [service for service in services if GITLAB_URLS[service]]
+with ThreadPoolExecutor(max_workers=len(to_fetch) or 1) as ex:
+    list(ex.map(_download, to_fetch))
+
 print("Done.")
@@ -0,0 +1,271 @@
+"""
+Shared implementations of the unzip / zip / validate tasks.
+
+unzip_gtfs.py, zip_gtfs.py and run_validator.py are thin CLI wrappers around
+the functions here, and pipeline.py chains them inside one process so
+back-to-back tasks don't each pay interpreter startup and config loading.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import tomllib
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from fs_utils import buffered_extractall
+
+# orjson parses large validator reports several times faster than the stdlib
+# module and works on bytes directly; fall back to json when not installed.
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+TIMEFRAMES = ["current", "future", "weekly-update"]
+SERVICES = ["bus", "rail"]
+
+PROJECT_ROOT = Path(__file__).parent.parent
+GTFS_DIR = PROJECT_ROOT / "gtfs"
+UNZIPPED_DIR = PROJECT_ROOT / "gtfs-unzipped"
+PYPROJECT = PROJECT_ROOT / "pyproject.toml"
+JAR = PROJECT_ROOT / "gtfs-validator.jar"
+
+# Skip macOS filesystem artifacts
+SKIP_FILES = {".DS_Store"}
+SKIP_DIRS = {"__MACOSX"}
+
+# Use a fixed timestamp so identical content produces identical zips
+FIXED_DATE = (2020, 1, 1, 0, 0, 0)
+
+_WORKERS = min(8, os.cpu_count() or 1)
+
+# ---------------------------------------------------------------------------
+# unzip
+# ---------------------------------------------------------------------------
+
+
+def _extract_one(zip_path: Path, dest: Path) -> None:
+    if dest.exists():
+        shutil.rmtree(dest)
+    dest.mkdir(parents=True, exist_ok=True)
+
+    print(f"Unzipping {zip_path.relative_to(PROJECT_ROOT)} → {dest.relative_to(PROJECT_ROOT)}/")
+    buffered_extractall(zip_path, dest)
+
+
+def unzip(timeframe: str | None = None, service: str | None = None) -> None:
+    """Unzip gtfs/{timeframe}/*.zip archives into gtfs-unzipped/{timeframe}/{feed}/.
+
+    Collects every (zip, dest) pair first, then extracts the archives
+    concurrently — unzip work is a mix of file I/O and zlib inflation, both
+    of which release the GIL, so independent archives scale across threads.
+    """
+    jobs: list[tuple[Path, Path]] = []
+    for tf in [timeframe] if timeframe else TIMEFRAMES:
+        src_dir = GTFS_DIR / tf
+        if not src_dir.exists():
+            continue
+
+        zip_paths = sorted(src_dir.glob("*.zip"))
+
+        if service:
+            zip_paths = [p for p in zip_paths if service in p.stem]
+
+        for zip_path in zip_paths:
+            jobs.append((zip_path, UNZIPPED_DIR / tf / zip_path.stem))
+
+    with ThreadPoolExecutor(max_workers=_WORKERS) as ex:
+        list(ex.map(lambda job: _extract_one(*job), jobs))
+
+    print("Done.")
+
+
+# ---------------------------------------------------------------------------
+# zip
+# ---------------------------------------------------------------------------
+
+
+def iter_feed_files(base: str):
+    """Yield (path, archive name) pairs for the files to archive under *base*.
+
+    Walks with os.walk, pruning skip-listed directories in place so they are
+    never descended into. Everything stays a plain string: this loop can see
+    thousands of entries per feed, and per-entry Path construction plus
+    relative_to() is pure object churn here.
+    """
+    prefix = len(base) + 1
+    for root, dirs, files in os.walk(base):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for name in files:
+            if name not in SKIP_FILES:
+                full = os.path.join(root, name)
+                yield full, full[prefix:]
+
+
+def _zip_one(feed_dir: Path, dest: Path, compresslevel: int | None) -> None:
+    dest.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"Zipping {feed_dir.relative_to(PROJECT_ROOT)}/ → {dest.relative_to(PROJECT_ROOT)}")
+
+    with zipfile.ZipFile(dest, "w", zipfile.ZIP_DEFLATED, compresslevel=compresslevel) as zf:
+        for file_path, arcname in sorted(iter_feed_files(str(feed_dir))):
+            info = zipfile.ZipInfo(filename=arcname, date_time=FIXED_DATE)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            # zf.open(info, "w") takes the level from the ZipInfo, not the
+            # ZipFile, so it has to be set here for the fast level to apply.
+            info.compress_level = compresslevel
+            # Declaring the size up front lets zipfile pick zip64 headers
+            # only when actually needed, keeping small archives byte-stable.
+            info.file_size = os.path.getsize(file_path)
+            # Stream the file through the compressor in 1 MiB chunks instead
+            # of loading it whole — stop_times.txt alone can run to hundreds
+            # of MB.
+            with zf.open(info, "w") as zout, open(file_path, "rb") as fin:
+                shutil.copyfileobj(fin, zout, length=1 << 20)
+
+
+def zip_(timeframe: str | None = None, service: str | None = None, fast: bool = False) -> None:
+    """Zip gtfs-unzipped/{timeframe}/{feed}/ back into gtfs/{timeframe}/{feed}.zip.
+
+    Collects every (feed, dest) pair first, then compresses the archives
+    concurrently — DEFLATE dominates the runtime and zlib releases the GIL,
+    so independent feeds scale across threads. *fast* trades a few percent
+    of ratio for a large compression-CPU saving by using DEFLATE level 1;
+    the default (zlib level 6) keeps committed archives byte-stable.
+    """
+    compresslevel = 1 if fast else None
+
+    jobs: list[tuple[Path, Path]] = []
+    for tf in [timeframe] if timeframe else TIMEFRAMES:
+        src_dir = UNZIPPED_DIR / tf
+        if not src_dir.exists():
+            continue
+
+        feed_dirs = sorted(p for p in src_dir.iterdir() if p.is_dir())
+
+        if service:
+            feed_dirs = [p for p in feed_dirs if service in p.name]
+
+        for feed_dir in feed_dirs:
+            jobs.append((feed_dir, GTFS_DIR / tf / f"{feed_dir.name}.zip"))
+
+    with ThreadPoolExecutor(max_workers=_WORKERS) as ex:
+        list(ex.map(lambda job: _zip_one(*job, compresslevel), jobs))
+
+    print("Done.")
+
+
+# ---------------------------------------------------------------------------
+# validate
+# ---------------------------------------------------------------------------
+
+# Validator output is captured and printed under a lock so logs from
+# parallel runs don't interleave mid-line.
+print_lock = threading.Lock()
+
+
+def _run_one(timeframe: str, service: str, country_code: str) -> bool:
+    """Validate one feed; returns True when it passes with no ERROR notices."""
+    input_zip = PROJECT_ROOT / "gtfs" / timeframe / f"gtfs_{service}.zip"
+    output_dir = PROJECT_ROOT / "validation-output" / timeframe / service
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    cmd = [
+        "java", "-jar", str(JAR),
+        "--input", str(input_zip),
+        "--output_base", str(output_dir),
+        "--country_code", country_code,
+    ]
+
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    with print_lock:
+        print(f"Running: {' '.join(cmd)}\n")
+        if result.stdout:
+            print(result.stdout, end="")
+        if result.stderr:
+            print(result.stderr, end="", file=sys.stderr)
+
+    if result.returncode != 0:
+        return False
+
+    # Parse report.json and fail loudly if any ERROR-severity notices exist
+    report_path = output_dir / "report.json"
+    # Parse the raw bytes: read_text would materialize a second full copy of
+    # the report just to decode it before parsing.
+    notices = _loads(report_path.read_bytes()).get("notices", [])
+    errors = [n for n in notices if n.get("severity") == "ERROR"]
+
+    if errors:
+        error_list = "\n".join(
+            f"  • {e['code']} ({e['totalNotices']} occurrence(s))" for e in errors
+        )
+        with print_lock:
+            print(
+                f"\n{'=' * 60}\n"
+                f"GTFS VALIDATION FAILED — {len(errors)} error type(s) found in "
+                f"{timeframe} {service} feed:\n"
+                f"{error_list}\n"
+                f"\nSee full report: {output_dir / 'report.html'}\n"
+                f"{'=' * 60}",
+                file=sys.stderr,
+            )
+        return False
+
+    with print_lock:
+        print(f"Validation passed for {timeframe} {service} feed.")
+    return True
+
+
+def validate(timeframe: str | None = None, service: str | None = None) -> bool:
+    """Run the GTFS validator JAR against the selected feeds.
+
+    Each java -jar invocation is an independent multi-second JVM job, so the
+    targets run concurrently. Returns True when every feed passes; failures
+    are reported on stderr. Downloads the JAR automatically if missing.
+    """
+    with open(PYPROJECT, "rb") as f:
+        config = tomllib.load(f)["tool"]["lacmta-gtfs"]
+
+    country_code = config.get("default-country-code", "us")
+
+    if not JAR.exists():
+        print("JAR not found — downloading...")
+        subprocess.run(
+            ["python", str(PROJECT_ROOT / "scripts" / "download_validator.py")],
+            check=True,
+        )
+
+    if shutil.which("java") is None:
+        print(
+            "Error: Java not found on PATH.\n"
+            "Install Java 17+ by following the instructions at:\n"
+            "https://github.com/MobilityData/gtfs-validator?tab=readme-ov-file#using-the-command-line",
+            file=sys.stderr,
+        )
+        return False
+
+    # Collect all (timeframe, service) pairs to validate
+    targets = [
+        (tf, svc)
+        for tf in ([timeframe] if timeframe else TIMEFRAMES)
+        for svc in ([service] if service else SERVICES)
+        if (PROJECT_ROOT / "gtfs" / tf / f"gtfs_{svc}.zip").exists()
+    ]
+
+    if not targets:
+        print("No matching .zip files found to validate.", file=sys.stderr)
+        return False
+
+    with ThreadPoolExecutor(max_workers=len(targets)) as ex:
+        results = list(ex.map(lambda target: _run_one(*target, country_code), targets))
+
+    return all(results)
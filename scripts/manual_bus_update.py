@@ -14,11 +14,12 @@ Steps:
      directory.
 """
 
+import csv
 import shutil
 import zipfile
 from pathlib import Path
 
-import pandas as pd
+from fs_utils import parallel_extractall, replace_dir
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -58,8 +59,7 @@ if WORKING_BUS_DIR.exists():
 
 WORKING_BUS_DIR.mkdir(parents=True, exist_ok=True)
 
-with zipfile.ZipFile(zip_path, "r") as zf:
-    zf.extractall(WORKING_BUS_DIR)
+parallel_extractall(zip_path, WORKING_BUS_DIR)
 
 print("    Done.")
 
@@ -83,24 +83,40 @@ shutil.copy2(source_feed_info, working_feed_info)
 feed_start_date = input("  feed_start_date (YYYYMMDD): ").strip()
 feed_end_date = input("  feed_end_date   (YYYYMMDD): ").strip()
 
-# Basic format validation
+# Basic format validation: exactly 8 ASCII digits in a plausible YYYYMMDD
+# range. int() alone would accept underscore separators and a leading sign
+# (e.g. '2026_0826', '+20260826'), and str.isdigit alone accepts non-ASCII
+# digit characters, so the checks are combined.
 for label, value in [("feed_start_date", feed_start_date), ("feed_end_date", feed_end_date)]:
-    if not value.isdigit() or len(value) != 8:
-        raise ValueError(
-            f"Invalid {label} '{value}'. Expected 8-digit date in YYYYMMDD format."
-        )
-
-df = pd.read_csv(working_feed_info, dtype=str)
-
-if "feed_start_date" not in df.columns or "feed_end_date" not in df.columns:
+    if not (
+        len(value) == 8
+        and value.isascii()
+        and value.isdigit()
+        and 10_000_000 <= int(value, 10) <= 99_999_999
+    ):
+        raise ValueError(f"Invalid {label} '{value}'. Expected 8-digit date in YYYYMMDD format.")
+
+# feed_info.txt is typically a single data row, so the stdlib csv module is
+# plenty — no need to pull in pandas for this rewrite.
+with open(working_feed_info, newline="") as f:
+    reader = csv.DictReader(f)
+    fieldnames = reader.fieldnames or []
+    rows = list(reader)
+
+if "feed_start_date" not in fieldnames or "feed_end_date" not in fieldnames:
     raise ValueError(
         "feed_info.txt is missing expected columns "
         "'feed_start_date' and/or 'feed_end_date'."
     )
 
-df["feed_start_date"] = feed_start_date
-df["feed_end_date"] = feed_end_date
-df.to_csv(working_feed_info, index=False)
+for row in rows:
+    row["feed_start_date"] = feed_start_date
+    row["feed_end_date"] = feed_end_date
+
+with open(working_feed_info, "w", newline="") as f:
+    writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator="\n")
+    writer.writeheader()
+    writer.writerows(rows)
 
 print(
     f"    feed_start_date = {feed_start_date}, feed_end_date = {feed_end_date} "
@@ -112,14 +128,11 @@ print(
 # ---------------------------------------------------------------------------
 
 print(
-    f"\n[3/3] Copying {WORKING_BUS_DIR.relative_to(PROJECT_ROOT)} "
+    f"\n[3/3] Moving {WORKING_BUS_DIR.relative_to(PROJECT_ROOT)} "
     f"→ {CURRENT_BUS_DIR.relative_to(PROJECT_ROOT)} ..."
 )
 
-if CURRENT_BUS_DIR.exists():
-    shutil.rmtree(CURRENT_BUS_DIR)
-
-shutil.copytree(WORKING_BUS_DIR, CURRENT_BUS_DIR)
+replace_dir(WORKING_BUS_DIR, CURRENT_BUS_DIR)
 print("    Done.")
 
 print("\nManual bus update complete.")
@@ -7,17 +7,19 @@ Steps:
   1. Copy gtfs-unzipped/current/gtfs_rail/ into a working directory at
      temp/working-gtfs/current/gtfs_rail/.
   2. Prompt for a path to a GTFS zip containing pathways data.
-  3. Unzip that file into temp/pathways-import/.
-  4. Copy pathways.txt, levels.txt, and stops.txt from temp/pathways-import/
+  3. Extract pathways.txt, levels.txt, and stops.txt straight from the zip
      into the working directory, overwriting any existing files.
-  5. On success, overwrite gtfs-unzipped/current/gtfs_rail/ with the working
+  4. On success, overwrite gtfs-unzipped/current/gtfs_rail/ with the working
      directory.
 """
 
 import shutil
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+from fs_utils import fast_copytree, replace_dir
+
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
@@ -28,7 +30,6 @@ TEMP_DIR = PROJECT_ROOT / "temp"
 
 CURRENT_RAIL_DIR = UNZIPPED_DIR / "current" / "gtfs_rail"
 WORKING_RAIL_DIR = TEMP_DIR / "working-gtfs" / "current" / "gtfs_rail"
-PATHWAYS_IMPORT_DIR = TEMP_DIR / "pathways-import"
 
 PATHWAYS_FILES = ["pathways.txt", "levels.txt", "stops.txt"]
 
@@ -37,7 +38,7 @@ PATHWAYS_FILES = ["pathways.txt", "levels.txt", "stops.txt"]
 # ---------------------------------------------------------------------------
 
 print(
-    f"[1/4] Copying {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)} "
+    f"[1/3] Copying {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)} "
     f"→ {WORKING_RAIL_DIR.relative_to(PROJECT_ROOT)} ..."
 )
 
@@ -50,7 +51,7 @@ if not CURRENT_RAIL_DIR.exists():
 if WORKING_RAIL_DIR.exists():
     shutil.rmtree(WORKING_RAIL_DIR)
 
-shutil.copytree(CURRENT_RAIL_DIR, WORKING_RAIL_DIR)
+fast_copytree(CURRENT_RAIL_DIR, WORKING_RAIL_DIR)
 print("    Done.")
 
 # ---------------------------------------------------------------------------
@@ -67,56 +68,57 @@ if not zipfile.is_zipfile(zip_path):
     raise ValueError(f"File does not appear to be a valid zip: {zip_path}")
 
 # ---------------------------------------------------------------------------
-# Step 3: Unzip into temp/pathways-import/
+# Step 3: Extract pathways files from the zip into the working directory
 # ---------------------------------------------------------------------------
 
+# Only three members of the zip are needed, so stream just those straight
+# into the working directory rather than extracting the whole archive to a
+# temp/pathways-import/ staging area first.
+
 print(
-    f"\n[2/4] Unzipping {zip_path.name} "
-    f"→ {PATHWAYS_IMPORT_DIR.relative_to(PROJECT_ROOT)} ..."
+    f"\n[2/3] Extracting pathways files from {zip_path.name} "
+    f"→ {WORKING_RAIL_DIR.relative_to(PROJECT_ROOT)} ..."
 )
 
-if PATHWAYS_IMPORT_DIR.exists():
-    shutil.rmtree(PATHWAYS_IMPORT_DIR)
+with zipfile.ZipFile(zip_path) as zf:
+    names = set(zf.namelist())
 
-PATHWAYS_IMPORT_DIR.mkdir(parents=True, exist_ok=True)
+# Check all expected members and note overwrites before dispatching, so the
+# log stays ordered while the extractions themselves run in parallel.
+overwriting: dict[str, bool] = {}
+for filename in PATHWAYS_FILES:
+    if filename not in names:
+        raise FileNotFoundError(
+            f"Expected file not found in pathways zip: {filename}"
+        )
+    overwriting[filename] = (WORKING_RAIL_DIR / filename).exists()
 
-with zipfile.ZipFile(zip_path, "r") as zf:
-    zf.extractall(PATHWAYS_IMPORT_DIR)
 
-print("    Done.")
+def _extract_member(filename: str) -> None:
+    # One ZipFile handle per worker – a shared handle is not thread-safe.
+    with zipfile.ZipFile(zip_path) as zf:
+        with zf.open(filename) as src, open(WORKING_RAIL_DIR / filename, "wb") as dst:
+            shutil.copyfileobj(src, dst, length=1 << 20)
 
-# ---------------------------------------------------------------------------
-# Step 4: Copy pathways files into the working directory
-# ---------------------------------------------------------------------------
 
-print(f"\n[3/4] Copying pathways files into {WORKING_RAIL_DIR.relative_to(PROJECT_ROOT)} ...")
+with ThreadPoolExecutor(max_workers=len(PATHWAYS_FILES)) as ex:
+    list(ex.map(_extract_member, PATHWAYS_FILES))
 
 for filename in PATHWAYS_FILES:
-    src = PATHWAYS_IMPORT_DIR / filename
-    dest = WORKING_RAIL_DIR / filename
-    if not src.exists():
-        raise FileNotFoundError(
-            f"Expected file not found in pathways zip: {filename}"
-        )
-    overwriting = dest.exists()
-    shutil.copy2(src, dest)
-    print(f"    {filename} → copied{'  (overwrote existing)' if overwriting else ''}")
+    print(f"    {filename} → extracted{'  (overwrote existing)' if overwriting[filename] else ''}")
 
 print("    Done.")
 
 # ---------------------------------------------------------------------------
-# Step 5: Overwrite gtfs-unzipped/current/gtfs_rail/ with the working copy
+# Step 4: Overwrite gtfs-unzipped/current/gtfs_rail/ with the working copy
 # ---------------------------------------------------------------------------
 
 print(
-    f"\n[4/4] Copying {WORKING_RAIL_DIR.relative_to(PROJECT_ROOT)} "
+    f"\n[3/3] Moving {WORKING_RAIL_DIR.relative_to(PROJECT_ROOT)} "
     f"→ {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)} ..."
 )
 
-if CURRENT_RAIL_DIR.exists():
-    shutil.rmtree(CURRENT_RAIL_DIR)
-
-shutil.copytree(WORKING_RAIL_DIR, CURRENT_RAIL_DIR)
+replace_dir(WORKING_RAIL_DIR, CURRENT_RAIL_DIR)
 print("    Done.")
 
 print("\nRail pathways update complete.")
@@ -23,13 +23,13 @@ Usage:
 """
 
 import argparse
+import csv
 import shutil
 import tomllib
-import urllib.request
 import zipfile
 from pathlib import Path
 
-import pandas as pd
+from fs_utils import buffered_extractall, download_file, fast_copytree, replace_dir
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -40,43 +40,12 @@ META_PATH = PROJECT_ROOT / "gtfs-meta.toml"
 UNZIPPED_DIR = PROJECT_ROOT / "gtfs-unzipped"
 TEMP_DIR = PROJECT_ROOT / "temp"
 
-with open(META_PATH, "rb") as _f:
-    META = tomllib.load(_f)
-
 CURRENT_RAIL_DIR = UNZIPPED_DIR / "current" / "gtfs_rail"
 
 PATHWAYS_SOURCE_DIR = TEMP_DIR / "pathways-source"
 GTFS_TARGET_DIR = TEMP_DIR / "pathways-target"
 GITLAB_RAIL_DIR = TEMP_DIR / "gitlab-gtfs" / "rail"
 
-# ---------------------------------------------------------------------------
-# Argument parsing
-# ---------------------------------------------------------------------------
-
-parser = argparse.ArgumentParser(description="Merge GTFS pathways data from one feed into another.")
-parser.add_argument(
-    "--pathways-source",
-    choices=["current", "prompt"],
-    required=True,
-    help=(
-        "Where to get the pathways data from. "
-        "'current' uses gtfs-unzipped/current/gtfs_rail/; "
-        "'prompt' prompts for a GTFS .zip archive."
-    ),
-)
-parser.add_argument(
-    "--gtfs-target",
-    choices=["current", "gitlab", "prompt"],
-    required=True,
-    help=(
-        "Which GTFS feed to merge the pathways onto. "
-        "'current' uses gtfs-unzipped/current/gtfs_rail/; "
-        "'gitlab' fetches the latest from GitLab; "
-        "'prompt' prompts for a GTFS .zip archive."
-    ),
-)
-args = parser.parse_args()
-
 # ---------------------------------------------------------------------------
 # Helper: validate and return a user-supplied zip path
 # ---------------------------------------------------------------------------
@@ -103,242 +72,351 @@ def unzip_into(zip_path: Path, dest_dir: Path) -> None:
     if dest_dir.exists():
         shutil.rmtree(dest_dir)
     dest_dir.mkdir(parents=True, exist_ok=True)
-    with zipfile.ZipFile(zip_path, "r") as zf:
-        zf.extractall(dest_dir)
+    buffered_extractall(zip_path, dest_dir)
 
 
 # ---------------------------------------------------------------------------
-# Step 1: Populate temp/pathways-source/
+# Helper: read and print GTFS txt rows
 # ---------------------------------------------------------------------------
 
-print("=== Step 1: Prepare pathways source ===")
 
-if args.pathways_source == "current":
-    if not CURRENT_RAIL_DIR.exists():
-        raise FileNotFoundError(
-            f"Source directory does not exist: {CURRENT_RAIL_DIR}\n"
-            "Run 'poe unzip' first to populate gtfs-unzipped/current/."
-        )
-    print(
-        f"Copying {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)}"
-        f" → {PATHWAYS_SOURCE_DIR.relative_to(PROJECT_ROOT)} ..."
+def read_gtfs_rows(path: Path) -> tuple[list[str], list[dict[str, str]]]:
+    """Read a GTFS txt file into (fieldnames, rows-as-dicts)."""
+    with open(path, newline="") as f:
+        reader = csv.DictReader(f, restval="")
+        return list(reader.fieldnames or []), list(reader)
+
+
+def print_table(
+    rows: list[dict[str, str]], columns: list[str], max_rows: int | None = None
+) -> None:
+    """Print rows as a simple right-aligned table, showing at most *max_rows*."""
+    shown = rows if max_rows is None else rows[:max_rows]
+    widths = {
+        col: max(len(col), *(len(row.get(col, "")) for row in shown)) if shown else len(col)
+        for col in columns
+    }
+    print("  ".join(col.rjust(widths[col]) for col in columns))
+    for row in shown:
+        print("  ".join(row.get(col, "").rjust(widths[col]) for col in columns))
+    if len(shown) < len(rows):
+        print(f"... ({len(rows) - len(shown)} more rows)")
+
+
+def main() -> None:
+    # Argument parsing, config reads, and the merge itself all live here so
+    # that importing the module (e.g. from tests) does no work.
+    parser = argparse.ArgumentParser(
+        description="Merge GTFS pathways data from one feed into another."
     )
-    if PATHWAYS_SOURCE_DIR.exists():
-        shutil.rmtree(PATHWAYS_SOURCE_DIR)
-    shutil.copytree(CURRENT_RAIL_DIR, PATHWAYS_SOURCE_DIR)
-    print("    Done.")
-
-else:  # prompt
-    zip_path = prompt_for_zip("Path to pathways GTFS .zip archive")
-    print(f"\nUnzipping {zip_path.name} → {PATHWAYS_SOURCE_DIR.relative_to(PROJECT_ROOT)} ...")
-    unzip_into(zip_path, PATHWAYS_SOURCE_DIR)
-    print("    Done.")
-
-# ---------------------------------------------------------------------------
-# Step 2: Populate temp/pathways-target/
-# ---------------------------------------------------------------------------
-
-print("\n=== Step 2: Prepare GTFS target ===")
-
-if args.gtfs_target == "current":
-    if not CURRENT_RAIL_DIR.exists():
-        raise FileNotFoundError(
-            f"Source directory does not exist: {CURRENT_RAIL_DIR}\n"
-            "Run 'poe unzip' first to populate gtfs-unzipped/current/."
-        )
-    print(
-        f"Copying {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)}"
-        f" → {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)} ..."
+    parser.add_argument(
+        "--pathways-source",
+        choices=["current", "prompt"],
+        required=True,
+        help=(
+            "Where to get the pathways data from. "
+            "'current' uses gtfs-unzipped/current/gtfs_rail/; "
+            "'prompt' prompts for a GTFS .zip archive."
+        ),
     )
-    if GTFS_TARGET_DIR.exists():
-        shutil.rmtree(GTFS_TARGET_DIR)
-    shutil.copytree(CURRENT_RAIL_DIR, GTFS_TARGET_DIR)
-    print("    Done.")
-
-elif args.gtfs_target == "gitlab":
-    rail_url = META["gitlab"]["rail"]
-
-    GITLAB_RAIL_DIR.mkdir(parents=True, exist_ok=True)
-    gitlab_zip_path = GITLAB_RAIL_DIR / "gtfs_rail.zip"
-
-    print(f"Downloading rail GTFS from GitLab:\n    {rail_url}")
-    print(f"    → {gitlab_zip_path.relative_to(PROJECT_ROOT)} ...")
-    urllib.request.urlretrieve(rail_url, gitlab_zip_path)
-    print("    Download complete.")
-
-    print(
-        f"\nUnzipping {gitlab_zip_path.relative_to(PROJECT_ROOT)}"
-        f" → {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)} ..."
+    parser.add_argument(
+        "--gtfs-target",
+        choices=["current", "gitlab", "prompt"],
+        required=True,
+        help=(
+            "Which GTFS feed to merge the pathways onto. "
+            "'current' uses gtfs-unzipped/current/gtfs_rail/; "
+            "'gitlab' fetches the latest from GitLab; "
+            "'prompt' prompts for a GTFS .zip archive."
+        ),
     )
-    unzip_into(gitlab_zip_path, GTFS_TARGET_DIR)
-    print("    Done.")
-
-else:  # prompt
-    zip_path = prompt_for_zip("Path to GTFS .zip archive to merge onto")
-    print(f"\nUnzipping {zip_path.name} → {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)} ...")
-    unzip_into(zip_path, GTFS_TARGET_DIR)
-    print("    Done.")
-
-# ---------------------------------------------------------------------------
-# Summary
-# ---------------------------------------------------------------------------
-
-print("\n=== Setup complete ===")
-print(f"  Pathways source : {PATHWAYS_SOURCE_DIR.relative_to(PROJECT_ROOT)}")
-print(f"  GTFS target     : {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)}")
-print("\nReady to merge pathways data.")
-
-# ---------------------------------------------------------------------------
-# Step 3: Identify stops to carry over from the pathways source
-# ---------------------------------------------------------------------------
-
-print("\n=== Step 3: Identify stops in the pathways source ===")
-
-INCLUDED_STOPS: list[str] = META["pathways"]["included_stops"]
-print(f"Included parent station stop_ids from gtfs-meta.toml: {INCLUDED_STOPS}")
-
-stops_df = pd.read_csv(PATHWAYS_SOURCE_DIR / "stops.txt", dtype=str).fillna("")
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Print every row of the debug tables instead of capping them at 50 rows.",
+    )
+    args = parser.parse_args()
 
-# Recursively expand the set of stop_ids rooted at each included parent station.
-# At each iteration, add any stop whose parent_station is already in the set.
-in_scope: set[str] = set(INCLUDED_STOPS)
-while True:
-    children = set(stops_df.loc[stops_df["parent_station"].isin(in_scope), "stop_id"])
-    new = children - in_scope
-    if not new:
-        break
-    in_scope.update(new)
+    # Cap diagnostic tables so formatting work stays bounded for large feeds.
+    max_table_rows = None if args.verbose else 50
 
-scoped_stops = stops_df[stops_df["stop_id"].isin(in_scope)].reset_index(drop=True)
+    with open(META_PATH, "rb") as f:
+        meta = tomllib.load(f)
 
-print(f"\nFound {len(scoped_stops)} stops in scope:\n")
-print(
-    scoped_stops[["stop_id", "stop_name", "location_type", "parent_station"]].to_string(index=False)
-)
+    # -----------------------------------------------------------------------
+    # Step 1: Populate temp/pathways-source/
+    # -----------------------------------------------------------------------
 
-# ---------------------------------------------------------------------------
-# Step 4: Identify pathways to carry over from the pathways source
-# ---------------------------------------------------------------------------
+    print("=== Step 1: Prepare pathways source ===")
 
-print("\n=== Step 4: Identify pathways in the pathways source ===")
+    if args.pathways_source == "current":
+        if not CURRENT_RAIL_DIR.exists():
+            raise FileNotFoundError(
+                f"Source directory does not exist: {CURRENT_RAIL_DIR}\n"
+                "Run 'poe unzip' first to populate gtfs-unzipped/current/."
+            )
+        print(
+            f"Copying {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)}"
+            f" → {PATHWAYS_SOURCE_DIR.relative_to(PROJECT_ROOT)} ..."
+        )
+        if PATHWAYS_SOURCE_DIR.exists():
+            shutil.rmtree(PATHWAYS_SOURCE_DIR)
+        fast_copytree(CURRENT_RAIL_DIR, PATHWAYS_SOURCE_DIR)
+        print("    Done.")
+
+    else:  # prompt
+        zip_path = prompt_for_zip("Path to pathways GTFS .zip archive")
+        print(
+            f"\nUnzipping {zip_path.name} → {PATHWAYS_SOURCE_DIR.relative_to(PROJECT_ROOT)} ..."
+        )
+        unzip_into(zip_path, PATHWAYS_SOURCE_DIR)
+        print("    Done.")
+
+    # -----------------------------------------------------------------------
+    # Step 2: Populate temp/pathways-target/
+    # -----------------------------------------------------------------------
+
+    print("\n=== Step 2: Prepare GTFS target ===")
+
+    if args.gtfs_target == "current":
+        if not CURRENT_RAIL_DIR.exists():
+            raise FileNotFoundError(
+                f"Source directory does not exist: {CURRENT_RAIL_DIR}\n"
+                "Run 'poe unzip' first to populate gtfs-unzipped/current/."
+            )
+        print(
+            f"Copying {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)}"
+            f" → {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)} ..."
+        )
+        if GTFS_TARGET_DIR.exists():
+            shutil.rmtree(GTFS_TARGET_DIR)
+        fast_copytree(CURRENT_RAIL_DIR, GTFS_TARGET_DIR)
+        print("    Done.")
 
-pathways_path = PATHWAYS_SOURCE_DIR / "pathways.txt"
-scoped_pathways = None
+    elif args.gtfs_target == "gitlab":
+        rail_url = meta["gitlab"]["rail"]
 
-if not pathways_path.exists():
-    print("    No pathways.txt found in the pathways source – skipping.")
-else:
-    pathways_df = pd.read_csv(pathways_path, dtype=str).fillna("")
+        GITLAB_RAIL_DIR.mkdir(parents=True, exist_ok=True)
+        gitlab_zip_path = GITLAB_RAIL_DIR / "gtfs_rail.zip"
 
-    scoped_pathways = pathways_df[
-        pathways_df["from_stop_id"].isin(in_scope) & pathways_df["to_stop_id"].isin(in_scope)
-    ].reset_index(drop=True)
+        print(f"Downloading rail GTFS from GitLab:\n    {rail_url}")
+        print(f"    → {gitlab_zip_path.relative_to(PROJECT_ROOT)} ...")
+        download_file(rail_url, gitlab_zip_path)
+        print("    Download complete.")
 
-    print(f"Found {len(scoped_pathways)} pathways in scope (out of {len(pathways_df)} total):\n")
-    print(
-        scoped_pathways[
-            ["pathway_id", "from_stop_id", "to_stop_id", "pathway_mode", "is_bidirectional"]
-        ].to_string(index=False)
+        print(
+            f"\nUnzipping {gitlab_zip_path.relative_to(PROJECT_ROOT)}"
+            f" → {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)} ..."
+        )
+        unzip_into(gitlab_zip_path, GTFS_TARGET_DIR)
+        print("    Done.")
+
+    else:  # prompt
+        zip_path = prompt_for_zip("Path to GTFS .zip archive to merge onto")
+        print(f"\nUnzipping {zip_path.name} → {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)} ...")
+        unzip_into(zip_path, GTFS_TARGET_DIR)
+        print("    Done.")
+
+    # -----------------------------------------------------------------------
+    # Summary
+    # -----------------------------------------------------------------------
+
+    print("\n=== Setup complete ===")
+    print(f"  Pathways source : {PATHWAYS_SOURCE_DIR.relative_to(PROJECT_ROOT)}")
+    print(f"  GTFS target     : {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)}")
+    print("\nReady to merge pathways data.")
+
+    # -----------------------------------------------------------------------
+    # Step 3: Identify stops to carry over from the pathways source
+    # -----------------------------------------------------------------------
+
+    print("\n=== Step 3: Identify stops in the pathways source ===")
+
+    included_stops: list[str] = meta["pathways"]["included_stops"]
+    print(f"Included parent station stop_ids from gtfs-meta.toml: {included_stops}")
+
+    # The source files are only filtered on string membership and rewritten, so
+    # stream them with the csv module instead of building DataFrames.
+    _, stops_rows = read_gtfs_rows(PATHWAYS_SOURCE_DIR / "stops.txt")
+
+    # Recursively expand the set of stop_ids rooted at each included parent
+    # station. Build a parent → children map in one pass over the file, then
+    # walk it from the seed set: each stop is visited at most once, instead of
+    # rescanning every row for each level of the station hierarchy.
+    children_map: dict[str, list[str]] = {}
+    for row in stops_rows:
+        if row.get("parent_station"):
+            children_map.setdefault(row["parent_station"], []).append(row["stop_id"])
+
+    in_scope: set[str] = set(included_stops)
+    stack = list(in_scope)
+    while stack:
+        for child in children_map.get(stack.pop(), ()):
+            if child not in in_scope:
+                in_scope.add(child)
+                stack.append(child)
+
+    scope_fs = frozenset(in_scope)
+
+    scoped_stops = [row for row in stops_rows if row["stop_id"] in scope_fs]
+
+    print(f"\nFound {len(scoped_stops)} stops in scope:\n")
+    print_table(
+        scoped_stops,
+        ["stop_id", "stop_name", "location_type", "parent_station"],
+        max_rows=max_table_rows,
     )
 
-# ---------------------------------------------------------------------------
-# Step 5: Identify levels to carry over from the pathways source
-# ---------------------------------------------------------------------------
+    # -----------------------------------------------------------------------
+    # Step 4: Identify pathways to carry over from the pathways source
+    # -----------------------------------------------------------------------
 
-print("\n=== Step 5: Identify levels in the pathways source ===")
+    print("\n=== Step 4: Identify pathways in the pathways source ===")
 
-levels_path = PATHWAYS_SOURCE_DIR / "levels.txt"
-scoped_levels = None
+    pathways_path = PATHWAYS_SOURCE_DIR / "pathways.txt"
+    scoped_pathways = None
+    pathways_fieldnames: list[str] = []
 
-if not levels_path.exists():
-    print("    No levels.txt found in the pathways source – skipping.")
-else:
-    levels_df = pd.read_csv(levels_path, dtype=str).fillna("")
+    if not pathways_path.exists():
+        print("    No pathways.txt found in the pathways source – skipping.")
+    else:
+        pathways_fieldnames, pathways_rows = read_gtfs_rows(pathways_path)
 
-    # Collect the level_ids referenced by our in-scope stops
-    scoped_level_ids = set(scoped_stops["level_id"].dropna().unique()) - {""}
+        # Both endpoints must be in scope.
+        scoped_pathways = [
+            row
+            for row in pathways_rows
+            if row["from_stop_id"] in scope_fs and row["to_stop_id"] in scope_fs
+        ]
 
-    scoped_levels = levels_df[levels_df["level_id"].isin(scoped_level_ids)].reset_index(drop=True)
+        print(
+            f"Found {len(scoped_pathways)} pathways in scope "
+            f"(out of {len(pathways_rows)} total):\n"
+        )
+        print_table(
+            scoped_pathways,
+            ["pathway_id", "from_stop_id", "to_stop_id", "pathway_mode", "is_bidirectional"],
+            max_rows=max_table_rows,
+        )
 
-    print(f"Found {len(scoped_levels)} levels in scope (out of {len(levels_df)} total):\n")
-    print(scoped_levels.to_string(index=False))
+    # -----------------------------------------------------------------------
+    # Step 5: Identify levels to carry over from the pathways source
+    # -----------------------------------------------------------------------
 
-# ---------------------------------------------------------------------------
-# Step 6: Write merged data into temp/pathways-target/
-# ---------------------------------------------------------------------------
+    print("\n=== Step 5: Identify levels in the pathways source ===")
 
-print("\n=== Step 6: Merge pathways data into GTFS target ===")
+    levels_path = PATHWAYS_SOURCE_DIR / "levels.txt"
+    scoped_levels = None
+    levels_fieldnames: list[str] = []
 
-# --- stops.txt ---
+    if not levels_path.exists():
+        print("    No levels.txt found in the pathways source – skipping.")
+    else:
+        levels_fieldnames, levels_rows = read_gtfs_rows(levels_path)
 
-target_stops_path = GTFS_TARGET_DIR / "stops.txt"
-target_stops_df = pd.read_csv(target_stops_path, dtype=str).fillna("")
+        # Collect the level_ids referenced by our in-scope stops
+        scoped_level_ids = frozenset(row.get("level_id", "") for row in scoped_stops) - {""}
 
-# Add any missing pathway-related columns
-for col in ["stop_timezone", "wheelchair_boarding", "level_id"]:
-    if col not in target_stops_df.columns:
-        target_stops_df[col] = ""
+        scoped_levels = [row for row in levels_rows if row["level_id"] in scoped_level_ids]
 
-# Move tpis_name to the end of the column list (by label – data follows)
-if "tpis_name" in target_stops_df.columns:
-    cols = [c for c in target_stops_df.columns if c != "tpis_name"] + ["tpis_name"]
-    target_stops_df = target_stops_df[cols]
+        print(f"Found {len(scoped_levels)} levels in scope (out of {len(levels_rows)} total):\n")
+        print_table(scoped_levels, levels_fieldnames, max_rows=max_table_rows)
 
-# Align scoped_stops to the target column set (fill any missing columns with "")
-scoped_stops_aligned = scoped_stops.reindex(columns=target_stops_df.columns, fill_value="")
+    # -----------------------------------------------------------------------
+    # Step 6: Write merged data into temp/pathways-target/
+    # -----------------------------------------------------------------------
 
-# Index both DataFrames on stop_id and update target rows with scoped data
-target_stops_df = target_stops_df.set_index("stop_id")
-scoped_stops_aligned = scoped_stops_aligned.set_index("stop_id")
-target_stops_df.update(scoped_stops_aligned)
+    print("\n=== Step 6: Merge pathways data into GTFS target ===")
 
-# Append any scoped stops that do not yet exist in the target
-new_stops = scoped_stops_aligned[~scoped_stops_aligned.index.isin(target_stops_df.index)]
-if not new_stops.empty:
-    target_stops_df = pd.concat([target_stops_df, new_stops])
+    # --- stops.txt ---
 
-target_stops_df = target_stops_df.reset_index()
-target_stops_df.to_csv(target_stops_path, index=False)
-print(
-    f"stops.txt    – updated {len(scoped_stops_aligned)} rows, "
-    f"wrote {len(target_stops_df)} total rows."
-)
+    target_stops_path = GTFS_TARGET_DIR / "stops.txt"
+    target_fieldnames, target_rows = read_gtfs_rows(target_stops_path)
 
-# --- pathways.txt ---
+    # Add any missing pathway-related columns
+    for col in ["stop_timezone", "wheelchair_boarding", "level_id"]:
+        if col not in target_fieldnames:
+            target_fieldnames.append(col)
 
-if scoped_pathways is not None:
-    pathways_out_path = GTFS_TARGET_DIR / "pathways.txt"
-    scoped_pathways.to_csv(pathways_out_path, index=False)
-    print(f"pathways.txt – wrote {len(scoped_pathways)} rows.")
-else:
-    print(
-        """WARNING: No pathways data found in pathways source. Are you sure you provided the right file?"""
-    )  # noqa: E501
-
-# --- levels.txt ---
+    # Move tpis_name to the end of the column list
+    if "tpis_name" in target_fieldnames:
+        target_fieldnames = [c for c in target_fieldnames if c != "tpis_name"] + ["tpis_name"]
 
-if scoped_levels is not None:
-    levels_out_path = GTFS_TARGET_DIR / "levels.txt"
-    scoped_levels.to_csv(levels_out_path, index=False)
-    print(f"levels.txt   – wrote {len(scoped_levels)} rows.")
-else:
-    print("levels.txt   – no source data; skipped.")
+    # Merge keyed on stop_id: the merge only touches the scoped stops, so do it
+    # as dict updates — O(scoped rows) of work — rather than reindexing and
+    # rewriting an entire DataFrame. Insertion order keeps existing stops in
+    # place and appends new ones at the end, as before.
+    target_map: dict[str, dict[str, str]] = {row["stop_id"]: row for row in target_rows}
+    for row in scoped_stops:
+        aligned = {col: row.get(col, "") for col in target_fieldnames}
+        target_map.setdefault(aligned["stop_id"], {}).update(aligned)
 
-print("\nMerge complete.")
+    with open(target_stops_path, "w", newline="") as f:
+        # The excel dialect's default \r\n terminator would flip every line
+        # ending in the feed; keep the LF convention of the committed files.
+        writer = csv.DictWriter(
+            f,
+            fieldnames=target_fieldnames,
+            restval="",
+            extrasaction="ignore",
+            lineterminator="\n",
+        )
+        writer.writeheader()
+        writer.writerows(target_map.values())
 
-# ---------------------------------------------------------------------------
-# Step 7: Overwrite gtfs-unzipped/current/gtfs_rail/ with the merged target
-# ---------------------------------------------------------------------------
+    print(
+        f"stops.txt    – updated {len(scoped_stops)} rows, "
+        f"wrote {len(target_map)} total rows."
+    )
 
-print("\n=== Step 7: Move merged GTFS to gtfs-unzipped/current/gtfs_rail/ ===")
+    # --- pathways.txt ---
+
+    if scoped_pathways is not None:
+        pathways_out_path = GTFS_TARGET_DIR / "pathways.txt"
+        with open(pathways_out_path, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=pathways_fieldnames, extrasaction="ignore", lineterminator="\n"
+            )
+            writer.writeheader()
+            writer.writerows(scoped_pathways)
+        print(f"pathways.txt – wrote {len(scoped_pathways)} rows.")
+    else:
+        print(
+            """WARNING: No pathways data found in pathways source. Are you sure you provided the right file?"""
+        )  # noqa: E501
+
+    # --- levels.txt ---
+
+    if scoped_levels is not None:
+        levels_out_path = GTFS_TARGET_DIR / "levels.txt"
+        with open(levels_out_path, "w", newline="") as f:
+            writer = csv.DictWriter(
+                f, fieldnames=levels_fieldnames, extrasaction="ignore", lineterminator="\n"
+            )
+            writer.writeheader()
+            writer.writerows(scoped_levels)
+        print(f"levels.txt   – wrote {len(scoped_levels)} rows.")
+    else:
+        print("levels.txt   – no source data; skipped.")
+
+    print("\nMerge complete.")
+
+    # -----------------------------------------------------------------------
+    # Step 7: Overwrite gtfs-unzipped/current/gtfs_rail/ with the merged target
+    # -----------------------------------------------------------------------
+
+    print("\n=== Step 7: Move merged GTFS to gtfs-unzipped/current/gtfs_rail/ ===")
+
+    # The target is a throwaway staging directory, so rename it into place
+    # instead of copying every byte of the merged feed a second time.
+    replace_dir(GTFS_TARGET_DIR, CURRENT_RAIL_DIR)
 
-if CURRENT_RAIL_DIR.exists():
-    shutil.rmtree(CURRENT_RAIL_DIR)
+    print(
+        f"Moved {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)}"
+        f" → {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)}"
+    )
+    print("\nDone.")
 
-shutil.copytree(GTFS_TARGET_DIR, CURRENT_RAIL_DIR)
 
-print(
-    f"Copied {GTFS_TARGET_DIR.relative_to(PROJECT_ROOT)}"
-    f" → {CURRENT_RAIL_DIR.relative_to(PROJECT_ROOT)}"
-)
-print("\nDone.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Chains the unzip / zip / validate tasks in a single process.
+Usage: python scripts/pipeline.py <step> [<step> ...]
+       [--timeframe {current,future,weekly-update}] [--service {bus,rail}] [--fast]
+Steps run in the order given, e.g. `python scripts/pipeline.py zip validate`
+re-zips the feeds and validates them without paying interpreter startup and
+config loading once per task.
+"""
+
+import argparse
+import sys
+
+from gtfs_io import SERVICES, TIMEFRAMES, unzip, validate, zip_
+
+parser = argparse.ArgumentParser(description="Run unzip/zip/validate steps in one process.")
+parser.add_argument(
+    "steps",
+    nargs="+",
+    choices=["unzip", "zip", "validate"],
+    help="Steps to run, in the order given",
+)
+parser.add_argument(
+    "--timeframe",
+    choices=TIMEFRAMES,
+    default=None,
+    help="Which timeframe to process (default: all that exist on disk)",
+)
+parser.add_argument(
+    "--service",
+    choices=SERVICES,
+    default=None,
+    help="Which service to process (default: all services)",
+)
+parser.add_argument(
+    "--fast",
+    action="store_true",
+    help="Compress zips at DEFLATE level 1 (faster, slightly larger archives)",
+)
+args = parser.parse_args()
+
+for step in args.steps:
+    if step == "unzip":
+        unzip(timeframe=args.timeframe, service=args.service)
+    elif step == "zip":
+        zip_(timeframe=args.timeframe, service=args.service, fast=args.fast)
+    elif not validate(timeframe=args.timeframe, service=args.service):
+        sys.exit(1)